@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 import argparse
+import importlib.util
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import uvicorn
@@ -9,6 +12,30 @@ from src.config import load_config
 from src.api import create_app
 
 
+def remove_tree(path: Path) -> None:
+    """Remove a directory tree, unlinking its files from a thread pool."""
+    files = []
+    dirs = []
+    stack = [str(path)]
+    while stack:
+        current = stack.pop()
+        dirs.append(current)
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files.append(entry.path)
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        for _ in pool.map(os.unlink, files):
+            pass
+
+    # Parents are always recorded before their children
+    for directory in reversed(dirs):
+        os.rmdir(directory)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Algotester to CCS Event Feed")
     parser.add_argument(
@@ -34,17 +61,24 @@ def main():
 
     # Clear data directory if requested
     if args.clear_data:
-        import shutil
         if settings.data_dir.exists():
-            shutil.rmtree(settings.data_dir)
+            remove_tree(settings.data_dir)
             logging.info(f"Cleared data directory: {settings.data_dir}")
 
     app = create_app(settings)
 
+    # Prefer the C implementations, but fall back to uvicorn's own choice
+    # when they are not installed (uvloop is POSIX-only)
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+    http = "httptools" if importlib.util.find_spec("httptools") else "auto"
+
     uvicorn.run(
         app,
         host=settings.host,
         port=settings.port,
+        loop=loop,
+        http=http,
+        log_level="info",
     )
 
 
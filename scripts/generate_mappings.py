@@ -8,39 +8,44 @@ Run with: python scripts/generate_mappings.py --config config.yaml
 from __future__ import annotations
 
 import argparse
-import json
+import atexit
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 import httpx
+import orjson
 import questionary
 import yaml
 from pathlib import Path
 
 # Add parent directory to path to import src modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from src.config import load_config
+from src.config import SafeDumper, load_config, load_yaml_cached
+
+# Shared client so paginated requests reuse one HTTP/2 connection
+_CLIENT = httpx.Client(
+    http2=True,
+    timeout=30.0,
+    headers={"X-Requested-With": "XMLHttpRequest"},
+)
+atexit.register(_CLIENT.close)
+
+# Problem IDs appear in JavaScript formatter functions on the scoreboard page
+# Pattern: var formatter10197 = function(value, row, index)
+_FORMATTER_RE = re.compile(rb"var formatter(\d+)\s*=")
 
 
 def fetch_problem_ids_from_html(subdomain: str, contest_id: int) -> list[str]:
     """Fetch problem IDs from the HTML scoreboard page."""
-    url = f"https://{subdomain}.algotester.com/en/Contest/ViewScoreboard/{contest_id}?showUnofficial=False"
-    response = httpx.get(url, timeout=30.0)
+    url = f"https://{subdomain}.algotester.com/en/Contest/ViewScoreboard/{contest_id}"
+    response = _CLIENT.get(url, params={"showUnofficial": "False"})
     response.raise_for_status()
 
-    # Parse problem IDs from JavaScript formatter functions
-    # Pattern: var formatter10197 = function(value, row, index)
-    pattern = r'var formatter(\d+)\s*='
-    problem_ids = re.findall(pattern, response.text)
-
     # Remove duplicates while preserving order
-    seen = set()
-    unique_ids = []
-    for pid in problem_ids:
-        if pid not in seen:
-            seen.add(pid)
-            unique_ids.append(pid)
-
-    return unique_ids
+    problem_ids = dict.fromkeys(
+        m.group(1) for m in _FORMATTER_RE.finditer(response.content)
+    )
+    return [pid.decode("ascii") for pid in problem_ids]
 
 
 def fetch_scoreboard(api_key: str, subdomain: str, contest_id: int) -> dict:
@@ -49,21 +54,15 @@ def fetch_scoreboard(api_key: str, subdomain: str, contest_id: int) -> dict:
     offset = 0
     limit = 100
 
+    url = f"https://{subdomain}.algotester.com/en/Contest/ListScoreboardWithAPI/{contest_id}"
+    base_params = {"showUnofficial": "False", "limit": str(limit)}
+    headers = {"X-API-Key": api_key}
+
     while True:
-        url = (
-            f"https://{subdomain}.algotester.com/en/Contest/ListScoreboardWithAPI/{contest_id}"
-            f"?showUnofficial=False&offset={offset}&limit={limit}"
-        )
-        response = httpx.get(
-            url,
-            headers={
-                "X-Requested-With": "XMLHttpRequest",
-                "X-API-Key": api_key,
-            },
-            timeout=30.0,
-        )
+        params = {**base_params, "offset": str(offset)}
+        response = _CLIENT.get(url, params=params, headers=headers)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         rows = data.get("rows", [])
         all_rows.extend(rows)
@@ -81,13 +80,11 @@ def load_contest_package(package_path: Path) -> tuple[list[dict], list[dict]]:
     problems_file = package_path / "problems.yaml"
     teams_file = package_path / "teams.json"
 
-    with open(problems_file) as f:
-        problems = yaml.safe_load(f)
+    problems = load_yaml_cached(problems_file)
 
     teams = []
     if teams_file.exists():
-        with open(teams_file) as f:
-            teams = json.load(f)
+        teams = orjson.loads(teams_file.read_bytes())
 
     return problems, teams
 
@@ -108,19 +105,45 @@ def main():
     contest_id = settings.algotester_contest_id
     contest_package_path = settings.contest_package_path
 
-    print(f"Fetching problem list from HTML for contest {contest_id} on {subdomain}...")
-    algotester_problem_ids = fetch_problem_ids_from_html(subdomain, contest_id)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # Read the contest package while the scoreboard is downloading
+        print(f"Loading contest package from {contest_package_path}...")
+        package_future = pool.submit(load_contest_package, contest_package_path)
+
+        print(f"Fetching scoreboard for contest {contest_id} on {subdomain}...")
+        data = fetch_scoreboard(api_key, subdomain, contest_id)
 
-    print(f"Fetching scoreboard for contest {contest_id} on {subdomain}...")
-    data = fetch_scoreboard(api_key, subdomain, contest_id)
+        problems, teams = package_future.result()
 
     rows = data.get("rows", [])
     if not rows:
         print("No data found!")
         return
 
-    print(f"Loading contest package from {contest_package_path}...")
-    problems, teams = load_contest_package(contest_package_path)
+    # Problem IDs are the keys of each row's results, in first-seen order
+    algotester_problem_ids = list(dict.fromkeys(
+        pid for row in rows for pid in (row.get("Results") or {})
+    ))
+
+    # Before the contest starts rows may have no results for some problems;
+    # the HTML scoreboard lists every problem column
+    if len(algotester_problem_ids) < len(problems):
+        print(
+            f"Scoreboard results only mention {len(algotester_problem_ids)} of "
+            f"{len(problems)} problems, fetching problem list from HTML..."
+        )
+        try:
+            html_ids = fetch_problem_ids_from_html(subdomain, contest_id)
+        except httpx.HTTPError as e:
+            html_ids = []
+            print(f"WARNING: could not fetch problem list from HTML: {e}")
+        algotester_problem_ids = list(dict.fromkeys(html_ids + algotester_problem_ids))
+        if len(algotester_problem_ids) < len(problems):
+            print(
+                f"WARNING: only {len(algotester_problem_ids)} Algotester problems found "
+                f"for {len(problems)} contest package problems; results for unmapped "
+                "problems will be ignored by the poller"
+            )
 
     print(f"\nFound {len(algotester_problem_ids)} problems in Algotester")
     print(f"Found {len(problems)} problems in contest package")
@@ -134,6 +157,7 @@ def main():
         )
         for p in problems
     ]
+    choice_by_id = {c.value: c for c in problem_choices}
     problem_choices.append(questionary.Choice(title="Skip (no mapping)", value=None))
 
     # Map problems interactively
@@ -141,27 +165,25 @@ def main():
     print("PROBLEM MAPPING")
     print("=" * 60)
 
+    label_by_id = {p["id"]: p["label"] for p in problems}
+
     problem_mapping = {}
     for i, algo_id in enumerate(algotester_problem_ids):
         # Default to i-th problem if available
-        default_id = problems[i]["id"] if i < len(problems) else None
+        default_choice = choice_by_id[problems[i]["id"]] if i < len(problems) else None
 
         try:
             chosen = questionary.select(
                 f"Algotester problem {algo_id} -> ",
                 choices=problem_choices,
-                default=default_id,
+                default=default_choice,
             ).unsafe_ask()
         except KeyboardInterrupt:
             print("\nAborted.")
             return
 
-        if chosen is None:
-            print(f"  {algo_id} -> Skipped")
-        else:
+        if chosen is not None:
             problem_mapping[algo_id] = chosen
-            label = next((p["label"] for p in problems if p["id"] == chosen), "?")
-            print(f"  {algo_id} -> {label} ({chosen})")
 
     # Build team choices and sort both lists for default mapping
     if teams:
@@ -171,10 +193,10 @@ def main():
             f"{t['id']}: {t.get('display_name', t.get('name', 'Unknown'))}"
             for t in sorted_teams
         ]
-        team_id_list = [t["id"] for t in sorted_teams]
+        team_defaults = [f"{t['id']}: " for t in sorted_teams]
     else:
         team_choices = None
-        team_id_list = []
+        team_defaults = []
 
     # Sort algotester teams by ID for default mapping
     sorted_rows = sorted(rows, key=lambda r: r.get("Id", ""))
@@ -190,7 +212,7 @@ def main():
         team_name = row.get("Contestant", {}).get("Text", "").strip()
 
         # Default to i-th team if available
-        default_team = team_id_list[i] if i < len(team_id_list) else None
+        default_team = team_defaults[i] if i < len(team_defaults) else ""
 
         try:
             if team_choices:
@@ -198,16 +220,13 @@ def main():
                 chosen = questionary.autocomplete(
                     f"{algo_id} ({team_name}) -> ",
                     choices=team_choices,
-                    default=f"{default_team}: " if default_team else "",
+                    default=default_team,
                 ).unsafe_ask()
 
                 if chosen:
                     # Extract team ID from the choice
                     team_id = chosen.split(":")[0].strip()
                     team_mapping[algo_id] = team_id
-                    print(f"  {algo_id} -> {team_id}")
-                else:
-                    print(f"  {algo_id} -> Skipped")
             else:
                 # No teams in package, ask for manual input
                 team_id = questionary.text(
@@ -221,16 +240,44 @@ def main():
             print("\nAborted.")
             return
 
+    # Summarize all answers once, after the last prompt
+    print("\n" + "=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+    for algo_id in algotester_problem_ids:
+        chosen = problem_mapping.get(algo_id)
+        if chosen is None:
+            print(f"  {algo_id} -> Skipped")
+        else:
+            print(f"  {algo_id} -> {label_by_id.get(chosen, '?')} ({chosen})")
+    for row in sorted_rows:
+        algo_id = row.get("Id")
+        print(f"  {algo_id} -> {team_mapping.get(algo_id, 'Skipped')}")
+
     # Write problem mapping to the paths specified in config
-    with open(settings.problem_mapping_file, "w") as f:
+    with open(settings.problem_mapping_file, "w", encoding="utf-8") as f:
         f.write("# Problem mapping: Algotester problem ID -> CCS problem ID\n\n")
-        yaml.dump(problem_mapping, f, default_flow_style=False)
+        yaml.dump(
+            problem_mapping,
+            f,
+            Dumper=SafeDumper,
+            sort_keys=False,
+            default_flow_style=False,
+            allow_unicode=True,
+        )
     print(f"\nWrote problem mapping to {settings.problem_mapping_file}")
 
     # Write team mapping
-    with open(settings.team_mapping_file, "w") as f:
+    with open(settings.team_mapping_file, "w", encoding="utf-8") as f:
         f.write("# Team mapping: Algotester team ID -> CCS team ID\n\n")
-        yaml.dump(team_mapping, f, default_flow_style=False)
+        yaml.dump(
+            team_mapping,
+            f,
+            Dumper=SafeDumper,
+            sort_keys=False,
+            default_flow_style=False,
+            allow_unicode=True,
+        )
     print(f"Wrote team mapping to {settings.team_mapping_file}")
 
 
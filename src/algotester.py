@@ -1,72 +1,159 @@
 from __future__ import annotations
 
+import asyncio
+import socket
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any
 
 import httpx
+import orjson
+
+
+# Enable TCP keepalive so dead idle connections are detected quickly
+_SOCKET_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, "TCP_KEEPIDLE"):
+    _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30))
 
 
 class AlgotesterFetcher:
     BASE_URL = "https://{subdomain}.algotester.com/en/Contest/ListScoreboardWithAPI"
+    MAX_CONCURRENT_PAGES = 8
+    MAX_RETRIES = 3
 
     def __init__(self, api_key: str, subdomain: str, contest_id: int):
         self.BASE_URL = self.BASE_URL.format(subdomain=subdomain)
         self.contest_id = contest_id
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=1000,
+                max_keepalive_connections=100,
+                keepalive_expiry=30.0,
+            ),
+            retries=2,
+            socket_options=_SOCKET_OPTIONS,
+        )
         self._client = httpx.AsyncClient(
+            transport=transport,
             headers={
                 "X-Requested-With": "XMLHttpRequest",
                 "X-API-Key": api_key,
             },
-            timeout=30.0,
+            timeout=httpx.Timeout(connect=5.0, read=15.0, write=5.0, pool=5.0),
         )
+        # (show_unofficial, offset) -> (ETag, raw body, decoded rows) of the last response
+        self._page_cache: dict[tuple[bool, int], tuple[str | None, bytes, list[dict[str, Any]]]] = {}
 
     async def fetch_scoreboard(self, show_unofficial: bool = False) -> list[dict[str, Any]]:
-        """Fetch all rows from the scoreboard."""
-        all_rows = []
-        offset = 0
+        """Fetch all rows from the scoreboard.
+
+        The first page is fetched on its own; if it is full, further pages are
+        requested concurrently in batches that double in size until a short
+        page marks the end of the scoreboard.
+        """
         limit = 100
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAGES)
+        url = f"{self.BASE_URL}/{self.contest_id}"
+        base_params = {"showUnofficial": str(show_unofficial), "limit": str(limit)}
+
+        async def fetch_page(offset: int) -> list[dict[str, Any]]:
+            params = {**base_params, "offset": str(offset)}
+            cache_key = (show_unofficial, offset)
+            cached = self._page_cache.get(cache_key)
+            headers = {}
+            if cached is not None and cached[0]:
+                headers["If-None-Match"] = cached[0]
+
+            async with semaphore:
+                response = await self._get_with_retry(url, params, headers)
+            if response.status_code == 304 and cached is not None:
+                return cached[2]
+            response.raise_for_status()
 
+            # Only decode pages whose body actually changed
+            content = response.content
+            if cached is not None and cached[1] == content:
+                rows = cached[2]
+            else:
+                rows = orjson.loads(content).get("rows", [])
+            self._page_cache[cache_key] = (response.headers.get("ETag"), content, rows)
+            return rows
+
+        all_rows = list(await fetch_page(0))
+        if len(all_rows) < limit:
+            return all_rows
+
+        offset = limit
+        batch_size = 1
         while True:
-            url = (
-                f"{self.BASE_URL}/{self.contest_id}"
-                f"?showUnofficial={str(show_unofficial)}&offset={offset}&limit={limit}"
-            )
-            response = await self._client.get(url)
-            response.raise_for_status()
-            data = response.json()
+            offsets = [offset + i * limit for i in range(batch_size)]
+            pages = await asyncio.gather(*(fetch_page(o) for o in offsets))
+
+            for rows in pages:
+                all_rows.extend(rows)
+                if len(rows) < limit:
+                    return all_rows
+
+            offset += batch_size * limit
+            batch_size *= 2
+
+    async def _get_with_retry(
+        self,
+        url: str,
+        params: dict[str, str],
+        headers: dict[str, str],
+    ) -> httpx.Response:
+        """GET a URL, retrying with backoff on read timeouts and broken connections."""
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                return await self._client.get(url, params=params, headers=headers)
+            except (httpx.ReadTimeout, httpx.RemoteProtocolError):
+                await asyncio.sleep(0.5 * 2**attempt)
+        return await self._client.get(url, params=params, headers=headers)
 
-            rows = data.get("rows", [])
-            all_rows.extend(rows)
+    async def close(self):
+        await self._client.aclose()
 
-            if len(rows) < limit:
-                break
 
-            offset += limit
+# Shared read-only fallback for missing nested objects
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
 
-        return all_rows
-
-    async def close(self):
-        await self._client.aclose()
 
+@dataclass(slots=True)
+class ScoreboardRow:
+    """A normalized scoreboard row."""
 
-def parse_scoreboard_row(row: dict[str, Any]) -> dict[str, Any]:
-    """Parse a single scoreboard row into a normalized format."""
-    return {
-        "team_id": row.get("Id"),
-        "team_name": row.get("Contestant", {}).get("Text", "").strip(),
-        "rank": row.get("Rank"),
-        "score": row.get("Score", 0),
-        "penalty_ms": row.get("PenaltyMs", 0),
-        "is_unofficial": row.get("IsUnofficial", False),
-        "group": row.get("Group", {}).get("Text", ""),
-        "results": parse_results(row.get("Results", {})),
-    }
+    team_id: str | None
+    team_name: str
+    rank: int | None
+    score: int
+    penalty_ms: int
+    is_unofficial: bool
+    group: str
+    results: dict[str, dict[str, Any]]
 
 
-def parse_results(results: dict[str, Any]) -> dict[str, dict[str, Any]]:
+def parse_scoreboard_row(row: dict[str, Any]) -> ScoreboardRow:
+    """Parse a single scoreboard row into a normalized format."""
+    get = row.get
+    return ScoreboardRow(
+        get("Id"),
+        (get("Contestant") or _EMPTY).get("Text", "").strip(),
+        get("Rank"),
+        get("Score", 0),
+        get("PenaltyMs", 0),
+        get("IsUnofficial", False),
+        (get("Group") or _EMPTY).get("Text", ""),
+        parse_results(get("Results") or _EMPTY),
+    )
+
+
+def parse_results(results: Mapping[str, Any]) -> dict[str, dict[str, Any]]:
     """Parse problem results from a scoreboard row."""
-    parsed = {}
-    for problem_id, result in results.items():
-        parsed[problem_id] = {
+    return {
+        problem_id: {
             "is_accepted": result.get("IsAccepted", False),
             "attempts": result.get("Attempts", 0),
             "pending_attempts": result.get("PendingAttempts", 0),
@@ -74,4 +161,5 @@ def parse_results(results: dict[str, Any]) -> dict[str, dict[str, Any]]:
             "penalty_ms": result.get("PenaltyMs", 0),
             "is_first_accepted": result.get("IsFirstAccepted", False),
         }
-    return parsed
+        for problem_id, result in results.items()
+    }
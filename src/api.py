@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
 import logging
+from datetime import datetime
 from typing import Any, Optional
 
 import secrets
 
+import orjson
+
 from fastapi import Depends, FastAPI, HTTPException, Request, Response
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
 logger = logging.getLogger(__name__)
@@ -20,20 +23,25 @@ from .algotester import AlgotesterFetcher, parse_scoreboard_row
 
 
 def create_app(settings: Settings) -> FastAPI:
-    app = FastAPI(title="Algotester to CCS Event Feed")
+    app = FastAPI(
+        title="Algotester to CCS Event Feed",
+        default_response_class=ORJSONResponse,
+    )
 
     # Setup authentication
     security = HTTPBasic()
+    auth_username = settings.auth_username.encode("utf8")
+    auth_password = settings.auth_password.encode("utf8")
 
     def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
         """Verify HTTP Basic credentials."""
         correct_username = secrets.compare_digest(
             credentials.username.encode("utf8"),
-            settings.auth_username.encode("utf8")
+            auth_username
         )
         correct_password = secrets.compare_digest(
             credentials.password.encode("utf8"),
-            settings.auth_password.encode("utf8")
+            auth_password
         )
 
         if not (correct_username and correct_password):
@@ -47,6 +55,11 @@ def create_app(settings: Settings) -> FastAPI:
     # Load contest package
     contest_package = ContestPackage(settings.contest_package_path)
 
+    def verify_contest_id(contest_id: str, _: bool = Depends(verify_credentials)) -> None:
+        """Reject requests for any contest other than the loaded one."""
+        if contest_id != contest_package.contest_id:
+            raise HTTPException(status_code=404, detail="Contest not found")
+
     # Load mappings
     team_mapping = load_mapping(settings.team_mapping_file)
     problem_mapping = load_mapping(settings.problem_mapping_file)
@@ -58,14 +71,9 @@ def create_app(settings: Settings) -> FastAPI:
         """Get teams that exist in the team mapping."""
         return [t for t in contest_package.get_teams() if t["id"] in valid_team_ids]
 
-    # Parse contest start time
+    # Contest start time, parsed once by the contest package
     contest_data = contest_package.get_contest()
-    from datetime import datetime
-    start_time_str = contest_data.get("start_time")
-    if start_time_str:
-        contest_start_time = datetime.fromisoformat(start_time_str)
-    else:
-        contest_start_time = datetime.now()
+    contest_start_time = contest_package.start_time or datetime.now()
 
     # Initialize state manager
     state_manager = StateManager(
@@ -73,6 +81,7 @@ def create_app(settings: Settings) -> FastAPI:
         team_mapping=team_mapping,
         problem_mapping=problem_mapping,
         contest_start_time=contest_start_time,
+        save_interval=settings.save_interval,
     )
 
     # Initialize fetcher
@@ -86,7 +95,8 @@ def create_app(settings: Settings) -> FastAPI:
     app.state.team_mapping = team_mapping
     app.state.problem_mapping = problem_mapping
     app.state.polling_task = None
-    app.state.new_events = None  # Created in startup
+    # One queue per connected event-feed client, fed by poll_scoreboard
+    app.state.subscribers = set()
 
     # Judgement types data
     def get_judgement_types_data():
@@ -108,27 +118,57 @@ def create_app(settings: Settings) -> FastAPI:
             {"id": "python3", "name": "Python 3"},
         ]
 
+    def static_payload(data: Any) -> tuple[bytes, str]:
+        """Serialize data once and derive a strong ETag from the bytes."""
+        body = orjson.dumps(data)
+        return body, f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+    def static_response(request: Request, payload: tuple[bytes, str]) -> Response:
+        """Return a static payload, or 304 if the client already has it.
+
+        If-None-Match uses weak comparison, so W/ tags (as rewritten by
+        compressing proxies) and "*" also match.
+        """
+        body, etag = payload
+        headers = {"ETag": etag}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    # Static payloads never change, so serialize them once
+    judgement_types_data = get_judgement_types_data()
+    languages_data = get_languages_data()
+    judgement_types_payload = static_payload(judgement_types_data)
+    languages_payload = static_payload(languages_data)
+    contests_payload = static_payload([contest_data])
+    contest_payload = static_payload(contest_data)
+    problems_payload = static_payload(contest_package.get_problems())
+    teams_payload = static_payload(get_filtered_teams())
+
     # Initialize static events (including teams)
     # Only include teams that exist in the team mapping
     state_manager.initialize_static_events(
         contest=contest_data,
-        judgement_types=get_judgement_types_data(),
-        languages=get_languages_data(),
+        judgement_types=judgement_types_data,
+        languages=languages_data,
         problems=contest_package.get_problems(),
         teams=get_filtered_teams(),
     )
 
     @app.on_event("startup")
     async def startup():
-        # Create event in the correct event loop
-        app.state.new_events = asyncio.Event()
         # Start background polling
         app.state.polling_task = asyncio.create_task(poll_scoreboard())
+        state_manager.start_flusher()
 
     @app.on_event("shutdown")
     async def shutdown():
         if app.state.polling_task:
             app.state.polling_task.cancel()
+        await state_manager.close()
         await fetcher.close()
 
     async def poll_scoreboard():
@@ -136,24 +176,30 @@ def create_app(settings: Settings) -> FastAPI:
         while True:
             try:
                 rows = await fetcher.fetch_scoreboard()
-                parsed_rows = [parse_scoreboard_row(row) for row in rows]
+                # Parsed lazily while the state manager consumes them
+                parsed_rows = map(parse_scoreboard_row, rows)
 
                 # Process and generate events
-                new_events = await state_manager.process_scoreboard(parsed_rows)
-                if new_events:
-                    app.state.new_events.set()
-                    for event in new_events:
-                        event_type = event["type"]
-                        event_id = event["id"]
-                        if event_type == "submissions":
-                            sub = event["data"]
-                            logger.info(f"New submission: {event_id} (team={sub['team_id']}, problem={sub['problem_id']})")
-                        elif event_type == "judgements":
-                            judg = event["data"]
-                            logger.info(f"New judgement: {event_id} (submission={judg['submission_id']}, result={judg['judgement_type_id']})")
-
-                # Save after team events
-                state_manager.save()
+                update = await state_manager.process_scoreboard(parsed_rows)
+                if update.counts:
+                    # Wake subscribers; each reads what it is missing from the log
+                    for queue in app.state.subscribers:
+                        if not queue.full():
+                            queue.put_nowait(None)
+                    sub_count = update.counts.get("submissions", 0)
+                    judg_count = update.counts.get("judgements", 0)
+                    logger.info("Polled: %d new submissions, %d new judgements", sub_count, judg_count)
+
+                    if logger.isEnabledFor(logging.DEBUG):
+                        for event in state_manager.get_events_from_index(update.first_index):
+                            event_type = event.type
+                            event_id = event.id
+                            if event_type == "submissions":
+                                sub = event.data
+                                logger.debug(f"New submission: {event_id} (team={sub['team_id']}, problem={sub['problem_id']})")
+                            elif event_type == "judgements":
+                                judg = event.data
+                                logger.debug(f"New judgement: {event_id} (submission={judg['submission_id']}, result={judg['judgement_type_id']})")
 
             except Exception as e:
                 logger.error(f"Error polling scoreboard: {e}")
@@ -173,45 +219,30 @@ def create_app(settings: Settings) -> FastAPI:
 
     # Contest endpoints
     @app.get("/contests")
-    async def get_contests(_: bool = Depends(verify_credentials)):
-        return [contest_package.get_contest()]
+    async def get_contests(request: Request, _: bool = Depends(verify_credentials)):
+        return static_response(request, contests_payload)
 
     @app.get("/contests/{contest_id}")
-    async def get_contest(contest_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
-        return contest
+    async def get_contest(request: Request, _: None = Depends(verify_contest_id)):
+        return static_response(request, contest_payload)
 
     # Judgement types endpoint
     @app.get("/contests/{contest_id}/judgement-types")
-    async def get_judgement_types(contest_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
-        return get_judgement_types_data()
+    async def get_judgement_types(request: Request, _: None = Depends(verify_contest_id)):
+        return static_response(request, judgement_types_payload)
 
     # Languages endpoint
     @app.get("/contests/{contest_id}/languages")
-    async def get_languages(contest_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
-        return get_languages_data()
+    async def get_languages(request: Request, _: None = Depends(verify_contest_id)):
+        return static_response(request, languages_payload)
 
     # Problems endpoints
     @app.get("/contests/{contest_id}/problems")
-    async def get_problems(contest_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
-        return contest_package.get_problems()
+    async def get_problems(request: Request, _: None = Depends(verify_contest_id)):
+        return static_response(request, problems_payload)
 
     @app.get("/contests/{contest_id}/problems/{problem_id}")
-    async def get_problem(contest_id: str, problem_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
+    async def get_problem(problem_id: str, _: None = Depends(verify_contest_id)):
         problem = contest_package.get_problem_by_id(problem_id)
         if not problem:
             raise HTTPException(status_code=404, detail="Problem not found")
@@ -219,17 +250,11 @@ def create_app(settings: Settings) -> FastAPI:
 
     # Teams endpoints
     @app.get("/contests/{contest_id}/teams")
-    async def get_teams(contest_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
-        return get_filtered_teams()
+    async def get_teams(request: Request, _: None = Depends(verify_contest_id)):
+        return static_response(request, teams_payload)
 
     @app.get("/contests/{contest_id}/teams/{team_id}")
-    async def get_team(contest_id: str, team_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
+    async def get_team(team_id: str, _: None = Depends(verify_contest_id)):
         # Only return team if it's in the mapping
         if team_id not in valid_team_ids:
             raise HTTPException(status_code=404, detail="Team not found")
@@ -238,19 +263,16 @@ def create_app(settings: Settings) -> FastAPI:
             raise HTTPException(status_code=404, detail="Team not found")
         return team
 
+    # The submission and judgement lists return ORJSONResponse directly to
+    # skip jsonable_encoder; the state manager only holds JSON-safe dicts
+
     # Submissions endpoints
     @app.get("/contests/{contest_id}/submissions")
-    async def get_submissions(contest_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
-        return state_manager.get_submissions()
+    async def get_submissions(_: None = Depends(verify_contest_id)):
+        return ORJSONResponse(content=state_manager.get_submissions())
 
     @app.get("/contests/{contest_id}/submissions/{submission_id}")
-    async def get_submission(contest_id: str, submission_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
+    async def get_submission(submission_id: str, _: None = Depends(verify_contest_id)):
         submission = state_manager.get_submission(submission_id)
         if not submission:
             raise HTTPException(status_code=404, detail="Submission not found")
@@ -258,17 +280,11 @@ def create_app(settings: Settings) -> FastAPI:
 
     # Judgements endpoints
     @app.get("/contests/{contest_id}/judgements")
-    async def get_judgements(contest_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
-        return state_manager.get_judgements()
+    async def get_judgements(_: None = Depends(verify_contest_id)):
+        return ORJSONResponse(content=state_manager.get_judgements())
 
     @app.get("/contests/{contest_id}/judgements/{judgement_id}")
-    async def get_judgement(contest_id: str, judgement_id: str, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
+    async def get_judgement(judgement_id: str, _: None = Depends(verify_contest_id)):
         judgement = state_manager.get_judgement(judgement_id)
         if not judgement:
             raise HTTPException(status_code=404, detail="Judgement not found")
@@ -276,10 +292,7 @@ def create_app(settings: Settings) -> FastAPI:
 
     # Event feed endpoint (NDJSON streaming)
     @app.get("/contests/{contest_id}/event-feed")
-    async def event_feed(contest_id: str, request: Request, since_token: Optional[str] = None, _: bool = Depends(verify_credentials)):
-        contest = contest_package.get_contest()
-        if contest["id"] != contest_id:
-            raise HTTPException(status_code=404, detail="Contest not found")
+    async def event_feed(request: Request, since_token: Optional[str] = None, _: None = Depends(verify_contest_id)):
 
         # Validate token before starting stream
         if since_token is not None:
@@ -297,44 +310,34 @@ def create_app(settings: Settings) -> FastAPI:
 
         async def generate():
             logger.info(f"Event feed client connected: {client_ip} (since_token={since_token})")
+            # Subscribe before reading the backlog so no new event is missed.
+            # The queue only signals that the log grew, so at most one wakeup
+            # is buffered however slowly the client reads.
+            queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+            app.state.subscribers.add(queue)
             try:
-                # Get events since token (or all events if no token)
-                events = state_manager.get_events_since_token(since_token)
+                # Get events since token (or all events if no token), already encoded
+                backlog = state_manager.get_events_since_token_bytes(since_token)
+                last_token = state_manager.get_last_token() or "0"
 
                 # Send all events
-                for event in events:
-                    yield json.dumps(event) + "\n"
-
-                # Track last token for streaming new events
-                last_token = state_manager.get_last_token()
-
-                # Keep connection alive and stream new events
-                import time
-                last_send_time = time.time()
+                if backlog:
+                    yield backlog
 
+                # Stream new events as the poller publishes them
                 while True:
-                    # Wait for new events or timeout
                     try:
-                        await asyncio.wait_for(
-                            app.state.new_events.wait(),
-                            timeout=30.0
-                        )
-                        app.state.new_events.clear()
+                        await asyncio.wait_for(queue.get(), timeout=120.0)
                     except asyncio.TimeoutError:
-                        pass
-
-                    # Get new events since last token
-                    new_events = state_manager.get_events_since_token(last_token)
-                    if new_events:
-                        for event in new_events:
-                            yield json.dumps(event) + "\n"
-                            last_token = event["token"]
-                        last_send_time = time.time()
-                    elif time.time() - last_send_time >= 120:
                         # Send keepalive newline per CCS spec
-                        yield "\n"
-                        last_send_time = time.time()
+                        yield b"\n"
+                        continue
+                    data = state_manager.get_events_since_token_bytes(last_token)
+                    last_token = state_manager.get_last_token() or "0"
+                    if data:
+                        yield data
             finally:
+                app.state.subscribers.discard(queue)
                 logger.info(f"Event feed client disconnected: {client_ip}")
 
         return StreamingResponse(
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import os
+import tempfile
 from pathlib import Path
+from typing import Any, Callable
 
+import orjson
 import yaml
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
+# Prefer the libyaml-backed C implementations when PyYAML was built with them
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 
 class Settings(BaseModel):
     algotester_api_key: str
@@ -13,6 +23,7 @@ class Settings(BaseModel):
     algotester_contest_id: int
     contest_package_path: Path
     polling_interval: int = 30
+    save_interval: int = 5
     data_dir: Path = Path("./data")
     team_mapping_file: Path = Path("./team_mapping.yaml")
     problem_mapping_file: Path = Path("./problem_mapping.yaml")
@@ -24,15 +35,67 @@ class Settings(BaseModel):
 
 def load_config(config_path: Path = Path("config.yaml")) -> Settings:
     with open(config_path) as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=SafeLoader)
     return Settings(**data)
 
 
 def load_mapping(mapping_path: Path) -> dict[str, str]:
     if not mapping_path.exists():
         return {}
-    with open(mapping_path) as f:
-        data = yaml.safe_load(f)
+    # Normalize before caching: unquoted numeric IDs load as int keys,
+    # which JSON cannot represent
+    return load_yaml_cached(mapping_path, _normalize_mapping)
+
+
+def _normalize_mapping(data: Any) -> dict[str, str]:
     if data is None:
         return {}
     return {str(k): str(v) for k, v in data.items()}
+
+
+def load_yaml_cached(yaml_path: Path, transform: Callable[[Any], Any] | None = None) -> Any:
+    """Load a YAML file, reusing a JSON sidecar cache while it is fresh.
+
+    The cache is stored next to the YAML file and keyed on its mtime and size.
+    If given, transform is applied to the parsed YAML and its result is cached.
+    Data that does not survive a JSON round trip is never cached.
+    """
+    stat = yaml_path.stat()
+    key = [stat.st_mtime_ns, stat.st_size]
+    cache_path = yaml_path.with_name(yaml_path.name + ".cache.json")
+
+    try:
+        cached = orjson.loads(cache_path.read_bytes())
+        if isinstance(cached, dict) and cached.get("key") == key:
+            return cached["data"]
+    except (OSError, ValueError):
+        pass
+
+    with open(yaml_path) as f:
+        data = yaml.load(f, Loader=SafeLoader)
+    if transform is not None:
+        data = transform(data)
+
+    try:
+        payload = orjson.dumps({"key": key, "data": data})
+    except TypeError:
+        return data
+    if orjson.loads(payload)["data"] != data:
+        return data
+
+    # Write atomically so a concurrent reader never sees a partial cache
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            # mkstemp creates 0600 files; make the cache as readable as the YAML
+            os.chmod(tmp_path, stat.st_mode & 0o666)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+    return data
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import json
+import functools
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Any
 
+import orjson
 import yaml
 
+from .config import SafeLoader, load_yaml_cached
 
+
+@functools.lru_cache(maxsize=128)
 def parse_duration(duration_val: str | int | float) -> timedelta:
     """Parse duration string like '5:00:00' or seconds into timedelta."""
     # YAML parses unquoted H:MM:SS as sexagesimal (base 60) integer
@@ -27,36 +31,39 @@ def parse_duration(duration_val: str | int | float) -> timedelta:
 
 def format_reltime(td: timedelta) -> str:
     """Format timedelta as CCS RELTIME (H:MM:SS.sss)."""
-    total_seconds = int(td.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    seconds = total_seconds % 60
-    millis = int(td.microseconds / 1000)
+    hours, remainder = divmod(int(td.total_seconds()), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    millis = td.microseconds // 1000
     return f"{hours}:{minutes:02d}:{seconds:02d}.{millis:03d}"
 
 
-def format_absolute_time(dt: datetime) -> str:
-    """Format datetime as CCS TIME (yyyy-MM-dd'T'HH:mm:ss.SSSXXX)."""
-    # Format: 2025-01-01T10:00:00.000+02:00
-    base = dt.strftime("%Y-%m-%dT%H:%M:%S")
-    millis = int(dt.microsecond / 1000)
+# UTC offset -> "+HH:MM" / "Z" suffix; only a handful of offsets ever occur
+_tz_suffix_cache: dict[timedelta | None, str] = {}
 
-    # Format timezone as +HH:MM or Z
-    if dt.tzinfo is None:
-        tz_str = ""
-    else:
-        offset = dt.utcoffset()
+
+def _tz_suffix(offset: timedelta | None) -> str:
+    suffix = _tz_suffix_cache.get(offset)
+    if suffix is None:
         if offset is None or offset.total_seconds() == 0:
-            tz_str = "Z"
+            suffix = "Z"
         else:
             total_seconds = int(offset.total_seconds())
             sign = "+" if total_seconds >= 0 else "-"
-            total_seconds = abs(total_seconds)
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            tz_str = f"{sign}{hours:02d}:{minutes:02d}"
+            hours, minutes = divmod(abs(total_seconds) // 60, 60)
+            suffix = f"{sign}{hours:02d}:{minutes:02d}"
+        _tz_suffix_cache[offset] = suffix
+    return suffix
 
-    return f"{base}.{millis:03d}{tz_str}"
+
+def format_absolute_time(dt: datetime) -> str:
+    """Format datetime as CCS TIME (yyyy-MM-dd'T'HH:mm:ss.SSSXXX)."""
+    # Format: 2025-01-01T10:00:00.000+02:00
+    tz_str = "" if dt.tzinfo is None else _tz_suffix(dt.utcoffset())
+    return (
+        f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+        f"T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+        f".{dt.microsecond // 1000:03d}{tz_str}"
+    )
 
 
 class ContestPackage:
@@ -67,34 +74,53 @@ class ContestPackage:
         self._teams: list[dict[str, Any]] = []
         self._load()
 
+        # The package is immutable after loading, so build the CCS views once
+        self._contest_ccs = self._build_contest()
+        self._problems_ccs = self._build_problems()
+        self._teams_ccs = self._build_teams()
+        self._contest_id = self._contest_ccs["id"]
+        self._build_indices()
+
     def _load(self):
         contest_file = self.package_path / "contest.yaml"
         problems_file = self.package_path / "problems.yaml"
         teams_file = self.package_path / "teams.json"
 
         with open(contest_file) as f:
-            self._contest = yaml.safe_load(f)
+            self._contest = yaml.load(f, Loader=SafeLoader)
 
-        with open(problems_file) as f:
-            self._problems = yaml.safe_load(f)
+        # YAML yields either a datetime or a string depending on quoting
+        start_time = self._contest.get("start_time")
+        if isinstance(start_time, str):
+            start_time = datetime.fromisoformat(start_time)
+        self._start_time = start_time if isinstance(start_time, datetime) else None
+
+        self._problems = load_yaml_cached(problems_file)
 
         if teams_file.exists():
-            with open(teams_file) as f:
-                self._teams = json.load(f)
+            self._teams = orjson.loads(teams_file.read_bytes())
+
+    def _build_indices(self):
+        # Iterate in reverse so the first entry wins on duplicate keys
+        self._problem_by_id = {p["id"]: p for p in reversed(self._problems_ccs)}
+        self._problem_by_label = {p["label"]: p for p in reversed(self._problems_ccs)}
+        self._team_by_id = {t["id"]: t for t in reversed(self._teams_ccs)}
 
     @property
     def contest_id(self) -> str:
-        return self._contest.get("id", "unknown")
+        return self._contest_id
+
+    @property
+    def start_time(self) -> datetime | None:
+        return self._start_time
 
     def get_contest(self) -> dict[str, Any]:
         """Return contest in CCS API format."""
-        start_time = self._contest.get("start_time")
-        if isinstance(start_time, str):
-            # Parse and reformat to ensure consistent format
-            dt = datetime.fromisoformat(start_time)
-            start_time_str = format_absolute_time(dt)
-        elif isinstance(start_time, datetime):
-            start_time_str = format_absolute_time(start_time)
+        return self._contest_ccs
+
+    def _build_contest(self) -> dict[str, Any]:
+        if self._start_time is not None:
+            start_time_str = format_absolute_time(self._start_time)
         else:
             start_time_str = None
 
@@ -116,6 +142,9 @@ class ContestPackage:
 
     def get_problems(self) -> list[dict[str, Any]]:
         """Return problems in CCS API format."""
+        return self._problems_ccs
+
+    def _build_problems(self) -> list[dict[str, Any]]:
         result = []
         for i, prob in enumerate(self._problems):
             result.append({
@@ -132,20 +161,17 @@ class ContestPackage:
 
     def get_problem_by_label(self, label: str) -> dict[str, Any] | None:
         """Get problem by label (A, B, C, etc.)."""
-        for prob in self.get_problems():
-            if prob["label"] == label:
-                return prob
-        return None
+        return self._problem_by_label.get(label)
 
     def get_problem_by_id(self, problem_id: str) -> dict[str, Any] | None:
         """Get problem by ID."""
-        for prob in self.get_problems():
-            if prob["id"] == problem_id:
-                return prob
-        return None
+        return self._problem_by_id.get(problem_id)
 
     def get_teams(self) -> list[dict[str, Any]]:
         """Return teams in CCS API format."""
+        return self._teams_ccs
+
+    def _build_teams(self) -> list[dict[str, Any]]:
         result = []
         for team in self._teams:
             result.append({
@@ -160,7 +186,4 @@ class ContestPackage:
 
     def get_team_by_id(self, team_id: str) -> dict[str, Any] | None:
         """Get team by ID."""
-        for team in self.get_teams():
-            if team["id"] == team_id:
-                return team
-        return None
+        return self._team_by_id.get(team_id)
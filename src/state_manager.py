@@ -1,13 +1,55 @@
 from __future__ import annotations
 
-import json
 import asyncio
+import bisect
+import functools
+import gzip
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Any
 
+import orjson
+
+from .algotester import ScoreboardRow
 from .contest_package import format_reltime, format_absolute_time
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_times(start_time: datetime, contest_time_ms: float) -> tuple[str, str]:
+    """Format a contest time as (absolute TIME, RELTIME) strings."""
+    contest_time = timedelta(milliseconds=contest_time_ms)
+    return format_absolute_time(start_time + contest_time), format_reltime(contest_time)
+
+
+# How every encoded event line starts, since token is the first field
+_TOKEN_PREFIX = b'{"token":"'
+
+
+@dataclass(slots=True)
+class Event:
+    """An event feed entry; serializes to the CCS event shape with orjson."""
+
+    token: str
+    id: str
+    type: str
+    op: str
+    data: dict[str, Any]
+
+
+@dataclass(slots=True)
+class ScoreboardUpdate:
+    """Where the events added by a scoreboard poll start, and how many of each type."""
+
+    first_index: int
+    counts: dict[str, int]
+
 
 class StateManager:
     def __init__(
@@ -16,76 +58,251 @@ class StateManager:
         team_mapping: dict[str, str],
         problem_mapping: dict[str, str],
         contest_start_time: datetime,
+        save_interval: float = 5.0,
     ):
         self.data_dir = data_dir
         self.team_mapping = team_mapping
         self.problem_mapping = problem_mapping
         self.contest_start_time = contest_start_time
+        self.save_interval = save_interval
 
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         self._submissions: dict[str, dict[str, Any]] = {}
         self._judgements: dict[str, dict[str, Any]] = {}
-        self._events: list[dict[str, Any]] = []
-        self._previous_state: dict[str, dict[str, dict[str, Any]]] = {}
+        # Event log as JSON Lines, decoded only on demand
+        self._events_log = bytearray()
+        # Start offset in _events_log and integer token of each event
+        self._event_offsets: list[int] = []
+        self._event_tokens: list[int] = []
+        self._previous_state: defaultdict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+        # Unjudged submission IDs per (team_id, problem_id), oldest first
+        self._pending_by_tp: dict[tuple[str, str], list[str]] = {}
         self._next_submission_id = 1
         self._next_judgement_id = 1
         self._next_token = 1
         self._lock = asyncio.Lock()
+        # Keeps saves in order, since they run outside _lock
+        self._save_lock = asyncio.Lock()
+        # Set when state changes; the flusher coalesces changes into one save
+        self._flush_event = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+        # Stores changed since the last save; only these are rewritten
+        self._dirty = {
+            "submissions": False,
+            "judgements": False,
+            "previous_state": False,
+            "meta": False,
+        }
+
+        # Bytes of _events_log before this offset are already in events.jsonl
+        self._events_persisted_offset = 0
+        # Events added per type during the current process_scoreboard call
+        self._new_event_counts: dict[str, int] = {}
 
         self._load()
 
     def _load(self):
         """Load persisted state from disk."""
-        submissions_file = self.data_dir / "submissions.json"
-        judgements_file = self.data_dir / "judgements.json"
-        events_file = self.data_dir / "events.json"
+        events_file = self.data_dir / "events.jsonl"
+        legacy_events_file = self.data_dir / "events.json"
         state_file = self.data_dir / "previous_state.json"
         meta_file = self.data_dir / "meta.json"
 
-        if submissions_file.exists():
-            with open(submissions_file) as f:
-                self._submissions = json.load(f)
+        submissions = self._read_compressed_json("submissions.json")
+        if submissions is not None:
+            self._submissions = submissions
 
-        if judgements_file.exists():
-            with open(judgements_file) as f:
-                self._judgements = json.load(f)
+        judgements = self._read_compressed_json("judgements.json")
+        if judgements is not None:
+            self._judgements = judgements
 
         if events_file.exists():
-            with open(events_file) as f:
-                self._events = json.load(f)
+            self._load_events(events_file)
+        elif legacy_events_file.exists():
+            # Migrated to events.jsonl on the next save
+            for e in orjson.loads(legacy_events_file.read_bytes()):
+                self._append_event(Event(**e))
 
         if state_file.exists():
-            with open(state_file) as f:
-                self._previous_state = json.load(f)
+            self._previous_state = defaultdict(dict, orjson.loads(state_file.read_bytes()))
 
         if meta_file.exists():
-            with open(meta_file) as f:
-                meta = json.load(f)
-                self._next_submission_id = meta.get("next_submission_id", 1)
-                self._next_judgement_id = meta.get("next_judgement_id", 1)
-                self._next_token = meta.get("next_token", 1)
+            meta = orjson.loads(meta_file.read_bytes())
+            self._next_submission_id = meta.get("next_submission_id", 1)
+            self._next_judgement_id = meta.get("next_judgement_id", 1)
+            self._next_token = meta.get("next_token", 1)
 
-    def save(self):
-        """Persist state to disk."""
-        with open(self.data_dir / "submissions.json", "w") as f:
-            json.dump(self._submissions, f, indent=2)
+        judged_sub_ids = {j["submission_id"] for j in self._judgements.values()}
+        for sub in self._submissions.values():
+            if sub["id"] not in judged_sub_ids:
+                key = (sub["team_id"], sub["problem_id"])
+                self._pending_by_tp.setdefault(key, []).append(sub["id"])
+
+    def _load_events(self, events_file: Path):
+        """Read events.jsonl into the in-memory log and index its lines."""
+        with open(events_file, "r+b") as f:
+            # Read straight into the log buffer, without an intermediate copy
+            log = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(log)
+
+            # Drop a partial trailing line left by an interrupted append
+            end = log.rfind(b"\n") + 1
+            if end < len(log):
+                del log[end:]
+                f.truncate(end)
+
+        offsets = self._event_offsets
+        tokens = self._event_tokens
+        offset = 0
+        while offset < end:
+            line_end = log.index(b"\n", offset)
+            offsets.append(offset)
+            # Events are written token-first, so avoid decoding the whole line
+            if log.startswith(_TOKEN_PREFIX, offset):
+                token_start = offset + len(_TOKEN_PREFIX)
+                tokens.append(int(log[token_start:log.index(b'"', token_start)]))
+            else:
+                tokens.append(int(orjson.loads(log[offset:line_end])["token"]))
+            offset = line_end + 1
 
-        with open(self.data_dir / "judgements.json", "w") as f:
-            json.dump(self._judgements, f, indent=2)
+        self._events_log = log
+        self._events_persisted_offset = end
 
-        with open(self.data_dir / "events.json", "w") as f:
-            json.dump(self._events, f, indent=2)
+    def save(self):
+        """Persist changed state to disk."""
+        self._write_snapshot(self._snapshot())
 
-        with open(self.data_dir / "previous_state.json", "w") as f:
-            json.dump(self._previous_state, f, indent=2)
+    async def save_async(self):
+        """Persist changed state from a worker thread, keeping the event loop free.
 
-        with open(self.data_dir / "meta.json", "w") as f:
-            json.dump({
+        Only taking the snapshot holds the state lock; serialization and file
+        writes run while scoreboard processing continues.
+        """
+        async with self._save_lock:
+            async with self._lock:
+                snapshot = self._snapshot()
+            write = asyncio.ensure_future(asyncio.to_thread(self._write_snapshot, snapshot))
+            try:
+                await asyncio.shield(write)
+            except asyncio.CancelledError:
+                # The thread cannot be stopped; hold _save_lock until it is done
+                # so a later save cannot be overwritten by this older snapshot
+                await write
+                raise
+
+    def start_flusher(self):
+        """Start the background task that saves changed state."""
+        self._flush_task = asyncio.create_task(self._flusher())
+
+    async def close(self):
+        """Stop the flusher and save any remaining changes."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.save_async()
+
+    async def _flusher(self):
+        """Save changed state at most once every save_interval seconds."""
+        while True:
+            await self._flush_event.wait()
+            # Let further changes accumulate into the same save
+            await asyncio.sleep(self.save_interval)
+            self._flush_event.clear()
+            try:
+                await self.save_async()
+            except Exception as e:
+                logger.error(f"Error saving state: {e}")
+                self._flush_event.set()
+                # Back off so a persistent disk error cannot spin with save_interval 0
+                await asyncio.sleep(max(self.save_interval, 1.0))
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Copy the changed state so it can be written without the lock held.
+
+        Submissions and judgements are never modified after creation, so
+        shallow copies are enough; previous state is copied per team.
+        """
+        dirty = self._dirty
+        snapshot: dict[str, Any] = {
+            "events": bytes(memoryview(self._events_log)[self._events_persisted_offset:])
+        }
+        if dirty["submissions"]:
+            snapshot["submissions"] = self._submissions.copy()
+        if dirty["judgements"]:
+            snapshot["judgements"] = self._judgements.copy()
+        if dirty["previous_state"]:
+            snapshot["previous_state"] = {
+                team_id: problems.copy() for team_id, problems in self._previous_state.items()
+            }
+        if dirty["meta"]:
+            snapshot["meta"] = {
                 "next_submission_id": self._next_submission_id,
                 "next_judgement_id": self._next_judgement_id,
                 "next_token": self._next_token,
-            }, f, indent=2)
+            }
+        for key in dirty:
+            dirty[key] = False
+        return snapshot
+
+    def _write_snapshot(self, snapshot: dict[str, Any]):
+        """Write a snapshot taken by _snapshot to disk."""
+        written = []
+        try:
+            new_events = snapshot["events"]
+            if new_events:
+                with open(self.data_dir / "events.jsonl", "ab") as f:
+                    size = f.tell()
+                    try:
+                        f.write(new_events)
+                        f.flush()
+                    except BaseException:
+                        # Cut off a partial append so the retry starts on a line boundary
+                        f.truncate(size)
+                        raise
+                self._events_persisted_offset += len(new_events)
+
+            # The two largest snapshots are gzipped; a fast level keeps saves cheap
+            for key in ("submissions", "judgements"):
+                if key in snapshot:
+                    self._write_json(f"{key}.json.gz", snapshot[key], compress=True)
+                written.append(key)
+            if "previous_state" in snapshot:
+                self._write_json("previous_state.json", snapshot["previous_state"])
+            written.append("previous_state")
+            if "meta" in snapshot:
+                # Meta is tiny, so keep it human-readable
+                self._write_json("meta.json", snapshot["meta"], orjson.OPT_INDENT_2)
+        except BaseException:
+            # Retry whatever was not written on the next save
+            for key in snapshot:
+                if key not in written and key in self._dirty:
+                    self._dirty[key] = True
+            raise
+
+    def _write_json(self, filename: str, data: Any, option: int = 0, compress: bool = False):
+        """Atomically replace a file in the data directory with serialized data."""
+        path = self.data_dir / filename
+        tmp_path = path.with_name(filename + ".tmp")
+        content = orjson.dumps(data, option=option)
+        if compress:
+            content = gzip.compress(content, compresslevel=1)
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+    def _read_compressed_json(self, filename: str) -> Any:
+        """Load a gzipped JSON file, falling back to an uncompressed one from older versions."""
+        gz_path = self.data_dir / (filename + ".gz")
+        if gz_path.exists():
+            return orjson.loads(gzip.decompress(gz_path.read_bytes()))
+        path = self.data_dir / filename
+        if path.exists():
+            return orjson.loads(path.read_bytes())
+        return None
 
     def initialize_static_events(
         self,
@@ -99,27 +316,15 @@ class StateManager:
 
         Only adds these if no events exist yet.
         """
-        if self._events:
+        if self._event_tokens:
             return
 
-        # Contest
-        self._add_event("contests", contest["id"], contest)
-
-        # Judgement types
-        for jt in judgement_types:
-            self._add_event("judgement-types", jt["id"], jt)
-
-        # Languages
-        for lang in languages:
-            self._add_event("languages", lang["id"], lang)
-
-        # Problems
-        for prob in problems:
-            self._add_event("problems", prob["id"], prob)
-
-        # Teams
-        for team in teams:
-            self._add_event("teams", team["id"], team)
+        records = [("contests", contest["id"], contest)]
+        records += [("judgement-types", jt["id"], jt) for jt in judgement_types]
+        records += [("languages", lang["id"], lang) for lang in languages]
+        records += [("problems", prob["id"], prob) for prob in problems]
+        records += [("teams", team["id"], team) for team in teams]
+        self._bulk_add_events(records)
 
         self.save()
 
@@ -137,19 +342,20 @@ class StateManager:
         sub_id = f"algotester-{self._next_submission_id}"
         self._next_submission_id += 1
 
-        contest_time = timedelta(milliseconds=contest_time_ms)
-        absolute_time = self.contest_start_time + contest_time
+        abs_time, rel_time = _format_times(self.contest_start_time, contest_time_ms)
 
         submission = {
             "id": sub_id,
             "team_id": team_id,
             "problem_id": problem_id,
             "language_id": "cpp",  # placeholder
-            "time": format_absolute_time(absolute_time),
-            "contest_time": format_reltime(contest_time),
+            "time": abs_time,
+            "contest_time": rel_time,
         }
 
         self._submissions[sub_id] = submission
+        self._pending_by_tp.setdefault((team_id, problem_id), []).append(sub_id)
+        self._dirty["submissions"] = True
         self._add_event("submissions", sub_id, submission)
 
         return submission
@@ -164,55 +370,146 @@ class StateManager:
         judg_id = f"algotester-{self._next_judgement_id}"
         self._next_judgement_id += 1
 
-        contest_time = timedelta(milliseconds=contest_time_ms)
-        absolute_time = self.contest_start_time + contest_time
+        abs_time, rel_time = _format_times(self.contest_start_time, contest_time_ms)
 
         judgement = {
             "id": judg_id,
             "submission_id": submission_id,
             "judgement_type_id": judgement_type_id,
-            "start_time": format_absolute_time(absolute_time),
-            "start_contest_time": format_reltime(contest_time),
-            "end_time": format_absolute_time(absolute_time),
-            "end_contest_time": format_reltime(contest_time),
+            "start_time": abs_time,
+            "start_contest_time": rel_time,
+            "end_time": abs_time,
+            "end_contest_time": rel_time,
         }
 
         self._judgements[judg_id] = judgement
+        sub = self._submissions.get(submission_id)
+        if sub is not None:
+            pending = self._pending_by_tp.get((sub["team_id"], sub["problem_id"]))
+            if pending and submission_id in pending:
+                pending.remove(submission_id)
+        self._dirty["judgements"] = True
         self._add_event("judgements", judg_id, judgement)
 
         return judgement
 
+    def _bulk_create_wa(self, team_id: str, problem_id: str, times_ms: Iterable[float]):
+        """Create a WA-judged submission at each contest time.
+
+        Equivalent to _create_submission followed by _create_judgement for every
+        time, without the per-call overhead.
+        """
+        start_time = self.contest_start_time
+        submissions = self._submissions
+        judgements = self._judgements
+        records = []
+        append = records.append
+
+        sub_seq = self._next_submission_id
+        judg_seq = self._next_judgement_id
+        for time_ms in times_ms:
+            abs_time, rel_time = _format_times(start_time, time_ms)
+
+            sub_id = f"algotester-{sub_seq}"
+            judg_id = f"algotester-{judg_seq}"
+            sub_seq += 1
+            judg_seq += 1
+
+            submission = {
+                "id": sub_id,
+                "team_id": team_id,
+                "problem_id": problem_id,
+                "language_id": "cpp",  # placeholder
+                "time": abs_time,
+                "contest_time": rel_time,
+            }
+            judgement = {
+                "id": judg_id,
+                "submission_id": sub_id,
+                "judgement_type_id": "WA",
+                "start_time": abs_time,
+                "start_contest_time": rel_time,
+                "end_time": abs_time,
+                "end_contest_time": rel_time,
+            }
+            submissions[sub_id] = submission
+            judgements[judg_id] = judgement
+
+            append(("submissions", sub_id, submission))
+            append(("judgements", judg_id, judgement))
+
+        if not records:
+            return
+        self._next_submission_id = sub_seq
+        self._next_judgement_id = judg_seq
+        self._dirty["submissions"] = self._dirty["judgements"] = True
+        self._bulk_add_events(records)
+
     def _add_event(self, event_type: str, obj_id: str, data: dict[str, Any]):
         """Add an event to the event log."""
-        token = str(self._next_token)
+        token = self._next_token
         self._next_token += 1
 
-        event = {
-            "token": token,
-            "id": obj_id,
-            "type": event_type,
-            "op": "create",
-            "data": data,
-        }
-        self._events.append(event)
-
-    async def process_scoreboard(self, rows: list[dict[str, Any]]):
-        """Process scoreboard data and generate submissions/judgements."""
+        self._append_event(Event(str(token), obj_id, event_type, "create", data))
+        self._new_event_counts[event_type] = self._new_event_counts.get(event_type, 0) + 1
+        self._dirty["meta"] = True
+
+    def _append_event(self, event: Event):
+        """Encode an event onto the end of the event log."""
+        self._event_offsets.append(len(self._events_log))
+        self._event_tokens.append(int(event.token))
+        self._events_log += orjson.dumps(event)
+        self._events_log += b"\n"
+
+    def _bulk_add_events(self, records: Iterable[tuple[str, str, dict[str, Any]]]):
+        """Add (type, id, data) events to the event log in order."""
+        log = self._events_log
+        offsets_append = self._event_offsets.append
+        tokens_append = self._event_tokens.append
+        dumps = orjson.dumps
+        counts = self._new_event_counts
+        token = self._next_token
+        for event_type, obj_id, data in records:
+            offsets_append(len(log))
+            tokens_append(token)
+            log += dumps(Event(str(token), obj_id, event_type, "create", data))
+            log += b"\n"
+            counts[event_type] = counts.get(event_type, 0) + 1
+            token += 1
+        if token != self._next_token:
+            self._next_token = token
+            self._dirty["meta"] = True
+
+    async def process_scoreboard(self, rows: Iterable[ScoreboardRow]) -> ScoreboardUpdate:
+        """Process scoreboard data and generate submissions/judgements.
+
+        The new events stay encoded in the log; pass the returned first_index
+        to get_events_from_index to decode them.
+        """
         async with self._lock:
-            new_events_start = len(self._events)
+            new_events_start = len(self._event_tokens)
+            self._new_event_counts = {}
+            problem_mapping = self.problem_mapping
 
             for row in rows:
-                algotester_team_id = row["team_id"]
+                algotester_team_id = row.team_id
                 ccs_team_id = self.team_mapping.get(algotester_team_id)
 
                 if not ccs_team_id:
                     continue
 
-                for algotester_prob_id, result in row["results"].items():
-                    problem_id = self.problem_mapping.get(algotester_prob_id)
-                    if not problem_id:
-                        continue
+                # Only results that differ from the previous poll can produce events
+                team_state = self._previous_state[ccs_team_id]
+                changed = [
+                    (problem_id, result)
+                    for algotester_prob_id, result in row.results.items()
+                    if (problem_id := problem_mapping.get(algotester_prob_id))
+                    and team_state.get(problem_id) != result
+                ]
+                if not changed:
+                    continue
 
+                for problem_id, result in changed:
                     self._process_team_problem(
                         ccs_team_id,
                         problem_id,
@@ -220,17 +517,14 @@ class StateManager:
                     )
 
                 # Update previous state
-                if ccs_team_id not in self._previous_state:
-                    self._previous_state[ccs_team_id] = {}
-
-                for algotester_prob_id, result in row["results"].items():
-                    problem_id = self.problem_mapping.get(algotester_prob_id)
-                    if problem_id:
-                        self._previous_state[ccs_team_id][problem_id] = result
+                for problem_id, result in changed:
+                    team_state[problem_id] = result
+                self._dirty["previous_state"] = True
 
-            self.save()
+            if any(self._dirty.values()):
+                self._flush_event.set()
 
-            return self._events[new_events_start:]
+            return ScoreboardUpdate(new_events_start, self._new_event_counts)
 
     def _process_team_problem(
         self,
@@ -313,16 +607,12 @@ class StateManager:
             if curr_accepted and not prev_accepted:
                 # Create WA submissions then AC
                 wa_count = direct_new - 1
-                for _ in range(wa_count):
-                    sub = self._create_submission(team_id, problem_id, curr_time_ms)
-                    self._create_judgement(sub["id"], "WA", curr_time_ms)
+                self._bulk_create_wa(team_id, problem_id, [curr_time_ms] * wa_count)
                 sub = self._create_submission(team_id, problem_id, curr_time_ms)
                 self._create_judgement(sub["id"], "AC", curr_time_ms)
             else:
                 # All WA
-                for _ in range(direct_new):
-                    sub = self._create_submission(team_id, problem_id, curr_time_ms)
-                    self._create_judgement(sub["id"], "WA", curr_time_ms)
+                self._bulk_create_wa(team_id, problem_id, [curr_time_ms] * direct_new)
 
     def _generate_initial_submissions(
         self,
@@ -345,10 +635,7 @@ class StateManager:
         time_step = time_ms / (total_judged + 1) if total_judged > 0 else time_ms
 
         # Generate WA submissions
-        for i in range(wa_count):
-            sub_time = time_step * (i + 1)
-            sub = self._create_submission(team_id, problem_id, sub_time)
-            self._create_judgement(sub["id"], "WA", sub_time)
+        self._bulk_create_wa(team_id, problem_id, [time_step * (i + 1) for i in range(wa_count)])
 
         # Generate AC submission
         if is_accepted:
@@ -361,16 +648,7 @@ class StateManager:
 
     def _get_pending_submissions(self, team_id: str, problem_id: str) -> list[dict[str, Any]]:
         """Get submissions without judgements for a team/problem."""
-        judged_sub_ids = {j["submission_id"] for j in self._judgements.values()}
-        pending = []
-        for sub in self._submissions.values():
-            if (
-                sub["team_id"] == team_id
-                and sub["problem_id"] == problem_id
-                and sub["id"] not in judged_sub_ids
-            ):
-                pending.append(sub)
-        return sorted(pending, key=lambda x: int(x["id"]))
+        return [self._submissions[sid] for sid in self._pending_by_tp.get((team_id, problem_id), ())]
 
     def get_submissions(self) -> list[dict[str, Any]]:
         return list(self._submissions.values())
@@ -384,14 +662,33 @@ class StateManager:
     def get_judgement(self, judg_id: str) -> dict[str, Any] | None:
         return self._judgements.get(judg_id)
 
-    def get_events_since_token(self, since_token: str | None = None) -> list[dict[str, Any]]:
+    def get_events_since_token(self, since_token: str | None = None) -> list[Event]:
         """Get events since a given token.
 
         Raises:
             ValueError: If the token is invalid (not a number or out of range).
         """
+        return self._events_from(self._index_after_token(since_token))
+
+    def get_events_since_token_bytes(self, since_token: str | None = None) -> bytes:
+        """Get events since a given token as encoded NDJSON, without decoding them.
+
+        Raises:
+            ValueError: If the token is invalid (not a number or out of range).
+        """
+        return self._events_bytes_from(self._index_after_token(since_token))
+
+    def get_all_events(self) -> list[Event]:
+        return self._events_from(0)
+
+    def get_events_from_index(self, index: int) -> list[Event]:
+        """Decode the events from a log position, e.g. ScoreboardUpdate.first_index."""
+        return self._events_from(index)
+
+    def _index_after_token(self, since_token: str | None) -> int:
+        """Return the log position of the first event after since_token."""
         if since_token is None:
-            return self._events.copy()
+            return 0
 
         try:
             token_int = int(since_token)
@@ -406,13 +703,23 @@ class StateManager:
         if token_int > max_token:
             raise ValueError(f"Unknown token: {since_token}")
 
-        return [e for e in self._events if int(e["token"]) > token_int]
+        # Tokens are increasing, so the result is a tail of the log
+        return bisect.bisect_right(self._event_tokens, token_int)
+
+    def _events_bytes_from(self, index: int) -> bytes:
+        """Copy the encoded events from the given position to the end of the log."""
+        if index >= len(self._event_offsets):
+            return b""
+        # Slicing through a memoryview copies once instead of twice
+        return bytes(memoryview(self._events_log)[self._event_offsets[index]:])
 
-    def get_all_events(self) -> list[dict[str, Any]]:
-        return self._events.copy()
+    def _events_from(self, index: int) -> list[Event]:
+        """Decode the events from the given position to the end of the log."""
+        data = self._events_bytes_from(index)
+        return [Event(**orjson.loads(line)) for line in data.splitlines()]
 
     def get_last_token(self) -> str | None:
         """Get the last event token, or None if no events."""
-        if self._events:
-            return self._events[-1]["token"]
+        if self._event_tokens:
+            return str(self._event_tokens[-1])
         return None